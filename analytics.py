@@ -4,6 +4,10 @@ import shap
 import numpy as np
 from math import pi
 import pandas as pd
+from calibration import calibrated_proba
+from risk import HIGH_THRESHOLD, MODERATE_THRESHOLD, risk_band
+from resources import get_explainer
+from pipeline import scoring_pipeline
 
 def render_analytics(df, features, model):
     st.subheader("📊 Personalized Diabetes Risk Insights")
@@ -14,12 +18,11 @@ def render_analytics(df, features, model):
         return
 
     user_input = st.session_state['user_input']
-    user_array = pd.DataFrame([user_input], columns=features)  # Ensures feature names
+    pipeline = scoring_pipeline(model)
+    user_array = pd.DataFrame(pipeline.transform(user_input), columns=features)  # Ensures feature names
     user_prob = st.session_state['user_prediction']['prob']
 
-    explainer = shap.Explainer(model, df[features])
-    shap_values = explainer(df[features])
-    user_shap = explainer(user_array)
+    user_shap = get_explainer()(user_array)
 
     tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs([
         "📊 Comparison Chart",
@@ -113,12 +116,13 @@ def render_analytics(df, features, model):
         </div>
         """, unsafe_allow_html=True)
         st.markdown("### 🚦 Risk Threshold Interpretation")
-        if user_prob >= 0.7:
-            st.error("🟥 High Risk: Above 70%")
-        elif user_prob >= 0.4:
-            st.warning("🟧 Moderate Risk: Between 40% and 70%")
+        band = risk_band(user_prob)
+        if band == "high":
+            st.error(f"🟥 High Risk: Above {HIGH_THRESHOLD:.0%}")
+        elif band == "moderate":
+            st.warning(f"🟧 Moderate Risk: Between {MODERATE_THRESHOLD:.0%} and {HIGH_THRESHOLD:.0%}")
         else:
-            st.success("🟩 Low Risk: Below 40%")
+            st.success(f"🟩 Low Risk: Below {MODERATE_THRESHOLD:.0%}")
 
     with tab5:
         st.markdown("### 📋 Input Summary")
@@ -133,13 +137,14 @@ def render_analytics(df, features, model):
             val = st.slider(feature, float(df[feature].min()), float(df[feature].max()), float(user_input[feature]))
             test_input[feature] = val
 
-        test_array = np.array(list(test_input.values())).reshape(1, -1)
-        test_prob = model.predict_proba(test_array)[0][1]
+        test_array = pipeline.transform(test_input)
+        test_prob = calibrated_proba(model, test_array)[0]
         st.metric(label="Predicted Risk with Adjusted Inputs", value=f"{test_prob*100:.1f}%")
 
-        if test_prob >= 0.7:
+        test_band = risk_band(test_prob)
+        if test_band == "high":
             st.error("🟥 High Risk")
-        elif test_prob >= 0.4:
+        elif test_band == "moderate":
             st.warning("🟧 Moderate Risk")
         else:
             st.success("🟩 Low Risk")
@@ -0,0 +1,27 @@
+import pandas as pd
+from pipeline import FeaturePipeline
+
+DATA_PATH = "diabetes.csv"
+
+# Features used by the risk model; zeros in these columns mean "not measured"
+MODEL_FEATURES = ['Glucose', 'BloodPressure', 'Insulin', 'BMI', 'Age']
+
+# Accepted input range per feature for manual entry
+FEATURE_BOUNDS = {
+    "Glucose": (50.0, 300.0),
+    "BloodPressure": (40.0, 200.0),
+    "Insulin": (15.0, 900.0),
+    "BMI": (10.0, 70.0),
+    "Age": (1.0, 120.0)
+}
+
+
+def build_pipeline():
+    return FeaturePipeline(MODEL_FEATURES, zero_as_missing=MODEL_FEATURES, bounds=FEATURE_BOUNDS)
+
+
+def load_dataset(path=DATA_PATH):
+    df = pd.read_csv(path)
+    pipeline = build_pipeline().fit(df)
+    df[MODEL_FEATURES] = pipeline.transform(df)
+    return df, list(MODEL_FEATURES), pipeline
@@ -1,67 +1,91 @@
 ﻿# diabetes_charts.py
 
 import pandas as pd
-import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 import plotly.express as px
 import plotly.graph_objects as go
 import streamlit as st
+from dataset import load_dataset
 
-# Set Streamlit page config
-st.set_page_config(layout="wide")
-st.title("Diabetes Risk Analysis Dashboard")
-
-# Load dataset
-df = pd.read_csv("diabetes.csv")
-
-# Data cleaning
-features = ['Glucose', 'BloodPressure', 'SkinThickness', 'Insulin', 'BMI']
-df[features] = df[features].replace(0, np.nan)
-df[features] = df[features].fillna(df[features].median())
-
-# Binning
-df["BMICategory"] = pd.cut(df["BMI"], bins=[0, 18.5, 25, 30, 35, 50],
-                           labels=["Underweight", "Normal", "Overweight", "Obese I", "Obese II"])
-df["AgeGroup"] = pd.cut(df["Age"], bins=[20, 30, 40, 50, 60, 80],
-                        labels=["20s", "30s", "40s", "50s", "60+"])
-
-# BMI vs Diabetes Rate
-fig1 = px.bar(
-    df.groupby("BMICategory", observed=True)["Outcome"].mean().reset_index(),
-    x="BMICategory", y="Outcome", title="Diabetes Rate by BMI Category",
-    labels={"Outcome": "Diabetes Rate"}
-)
-st.plotly_chart(fig1, use_container_width=True)
-
-# Age Group vs Diabetes Rate
-fig2 = px.bar(
-    df.groupby("AgeGroup", observed=True)["Outcome"].mean().reset_index(),
-    x="AgeGroup", y="Outcome", title="Diabetes Rate by Age Group",
-    labels={"Outcome": "Diabetes Rate"}
-)
-st.plotly_chart(fig2, use_container_width=True)
-
-# Pregnancies vs Diabetes Rate
-preg_stats = df.groupby("Pregnancies")["Outcome"].mean().reset_index()
-fig3 = px.scatter(preg_stats, x="Pregnancies", y="Outcome", title="Diabetes Rate by Pregnancies")
-fig3.add_trace(go.Scatter(x=preg_stats["Pregnancies"], y=preg_stats["Outcome"], mode='lines'))
-st.plotly_chart(fig3, use_container_width=True)
-
-# 3D Risk Plot
-fig4 = px.scatter_3d(df, x="Age", y="BMI", z="Pregnancies", color="Outcome",
-                     title="3D Risk View", color_continuous_scale="RdBu")
-st.plotly_chart(fig4)
-
-# Heatmap of Age x BMI vs Diabetes
-df['AgeBin'] = pd.cut(df['Age'], bins=[20,30,40,50,60,70], labels=['20s','30s','40s','50s','60s'])
-df['BMIBin'] = pd.cut(df['BMI'], bins=[0,18.5,25,30,35,50], labels=['Underweight','Normal','Overweight','Obese I','Obese II'])
-pivot = df.pivot_table(index="BMIBin", columns="AgeBin", values="Outcome", aggfunc="mean")
-
-st.subheader("Heatmap: Diabetes Rate by Age and BMI")
-plt.figure(figsize=(8, 6))
-
-sns.heatmap(pivot, annot=True, cmap="YlOrRd", fmt=".2f")
-plt.title("Diabetes Rate Heatmap by Age and BMI")
-st.pyplot(plt.gcf())
-plt.close()
+
+def load_chart_data(path="diabetes.csv"):
+    # Load dataset, cleaned by the same fitted pipeline as the model
+    df, _, _ = load_dataset(path)
+
+    # Binning
+    df["BMICategory"] = pd.cut(df["BMI"], bins=[0, 18.5, 25, 30, 35, 50],
+                               labels=["Underweight", "Normal", "Overweight", "Obese I", "Obese II"])
+    df["AgeGroup"] = pd.cut(df["Age"], bins=[20, 30, 40, 50, 60, 80],
+                            labels=["20s", "30s", "40s", "50s", "60+"])
+    return df
+
+
+def build_figures(df):
+    # BMI vs Diabetes Rate
+    fig1 = px.bar(
+        df.groupby("BMICategory", observed=True)["Outcome"].mean().reset_index(),
+        x="BMICategory", y="Outcome", title="Diabetes Rate by BMI Category",
+        labels={"Outcome": "Diabetes Rate"}
+    )
+
+    # Age Group vs Diabetes Rate
+    fig2 = px.bar(
+        df.groupby("AgeGroup", observed=True)["Outcome"].mean().reset_index(),
+        x="AgeGroup", y="Outcome", title="Diabetes Rate by Age Group",
+        labels={"Outcome": "Diabetes Rate"}
+    )
+
+    # Pregnancies vs Diabetes Rate
+    preg_stats = df.groupby("Pregnancies")["Outcome"].mean().reset_index()
+    fig3 = px.scatter(preg_stats, x="Pregnancies", y="Outcome", title="Diabetes Rate by Pregnancies")
+    fig3.add_trace(go.Scatter(x=preg_stats["Pregnancies"], y=preg_stats["Outcome"], mode='lines'))
+
+    # 3D Risk Plot
+    fig4 = px.scatter_3d(df, x="Age", y="BMI", z="Pregnancies", color="Outcome",
+                         title="3D Risk View", color_continuous_scale="RdBu")
+
+    return {"bmi_rate": fig1, "age_rate": fig2, "pregnancy_rate": fig3, "risk_3d": fig4}
+
+
+def build_heatmap(df):
+    # Heatmap of Age x BMI vs Diabetes
+    age_bin = pd.cut(df['Age'], bins=[20,30,40,50,60,70], labels=['20s','30s','40s','50s','60s'])
+    bmi_bin = pd.cut(df['BMI'], bins=[0,18.5,25,30,35,50], labels=['Underweight','Normal','Overweight','Obese I','Obese II'])
+    pivot = df.assign(AgeBin=age_bin, BMIBin=bmi_bin).pivot_table(
+        index="BMIBin", columns="AgeBin", values="Outcome", aggfunc="mean", observed=False)
+
+    fig = plt.figure(figsize=(8, 6))
+    sns.heatmap(pivot, annot=True, cmap="YlOrRd", fmt=".2f")
+    plt.title("Diabetes Rate Heatmap by Age and BMI")
+    return fig
+
+
+def render_dashboard(figures, heatmap):
+    # `heatmap` is either a live matplotlib figure or pre-rendered PNG bytes
+    st.plotly_chart(figures["bmi_rate"], use_container_width=True)
+    st.plotly_chart(figures["age_rate"], use_container_width=True)
+    st.plotly_chart(figures["pregnancy_rate"], use_container_width=True)
+    st.plotly_chart(figures["risk_3d"])
+
+    st.subheader("Heatmap: Diabetes Rate by Age and BMI")
+    if isinstance(heatmap, bytes):
+        st.image(heatmap)
+    else:
+        st.pyplot(heatmap)
+        plt.close(heatmap)
+
+
+if __name__ == "__main__":
+    from snapshot import load_snapshot, snapshot_mode_enabled
+
+    # Set Streamlit page config
+    st.set_page_config(layout="wide")
+    st.title("Diabetes Risk Analysis Dashboard")
+
+    snapshot = load_snapshot("charts") if snapshot_mode_enabled() else None
+    if snapshot is not None:
+        render_dashboard(snapshot["figures"], snapshot["images"]["heatmap"])
+    else:
+        df = load_chart_data()
+        render_dashboard(build_figures(df), build_heatmap(df))
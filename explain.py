@@ -1,12 +1,12 @@
 import streamlit as st
 import shap
 import matplotlib.pyplot as plt
+from resources import get_explainer
 
 def render_explain(df, features, model):
     st.subheader("🧠 Model Explainability with SHAP")
     X = df[features]
-    explainer = shap.Explainer(model, X)
-    shap_values = explainer(X)
+    shap_values = get_explainer()(X)
 
     st.markdown("### 🔍 Global Feature Importance")
     fig_summary, ax_summary = plt.subplots()
@@ -1,7 +1,5 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-from sklearn.linear_model import LogisticRegression
+from resources import get_dataset, get_model, resource_memory
 
 
 # Page config
@@ -54,21 +52,9 @@ st.markdown(
 )
 
 
-# Load dataset
-@st.cache_data
-def load_data():
-    df = pd.read_csv("diabetes.csv")
-    features = ['Glucose', 'BloodPressure', 'Insulin', 'BMI', 'Age']
-    for col in features:
-        df[col] = df[col].replace(0, np.nan)
-        df[col] = df[col].fillna(df[col].median())
-    return df, features
-
-df, features = load_data()
-X = df[features]
-y = df['Outcome']
-model = LogisticRegression(max_iter=1000)
-model.fit(X, y)
+# Shared across all sessions: one read-only dataset and one calibrated model per process
+df, features = get_dataset()
+model = get_model()
 
 # Sidebar menu
 st.sidebar.title("📟 Navigate")
@@ -97,4 +83,9 @@ with st.spinner("✨ Loading the vibe..."):
     #elif selected_tab == "🧠 Explain":
        # render_explain(df, features, model)
     elif selected_tab == "📥 Export":
-        render_export(df, features)
\ No newline at end of file
+        render_export(df, features)
+
+# Memory held by process-wide resources (built lazily by the pages above)
+with st.sidebar.expander("🧮 Shared resources"):
+    for name, nbytes in resource_memory().items():
+        st.caption(f"{name}: {nbytes / 1024 ** 2:.2f} MB")
@@ -1,17 +1,186 @@
 import streamlit as st
-import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from statsmodels.stats.proportion import proportion_confint
+from resources import get_data_version, get_rate_cube, session_frame
+from snapshot import load_snapshot, snapshot_mode_enabled
+
+
+def parse_edges(text):
+    try:
+        edges = sorted({float(v) for v in text.replace(";", ",").split(",") if v.strip()})
+    except ValueError:
+        return None
+    if len(edges) < 2 or not np.all(np.isfinite(edges)):
+        return None
+    return edges
+
+
+def default_edges(cube, feature, n_bins=5):
+    levels = cube.levels(feature)
+    # Round inner edges for readability; floor/ceil the outer ones so no row falls outside
+    lo, hi = np.floor(levels.min() * 10) / 10, np.ceil(levels.max() * 10) / 10
+    edges = np.linspace(lo, hi, n_bins + 1).round(1)
+    edges[0], edges[-1] = lo, hi
+    return ", ".join(f"{e:g}" for e in edges)
+
+
+def render_slice_explorer(cube):
+    st.markdown("#### 🔎 Slice Explorer")
+    st.markdown("_Pick one or two features and bin edges to compare diabetes rates across subgroups._")
+
+    col_a, col_b = st.columns(2)
+    with col_a:
+        feature_a = st.selectbox("Feature", cube.features, index=cube.features.index("Age"), key="slice_a")
+        edges_a = parse_edges(st.text_input("Bin edges", default_edges(cube, feature_a), key=f"edges_{feature_a}"))
+    with col_b:
+        feature_b = st.selectbox("Second feature (optional)", ["None"] + [f for f in cube.features if f != feature_a],
+                                 key="slice_b")
+        edges_b = None
+        if feature_b != "None":
+            edges_b = parse_edges(st.text_input("Bin edges", default_edges(cube, feature_b), key=f"edges_{feature_b}"))
+
+    if edges_a is None or (feature_b != "None" and edges_b is None):
+        st.warning("🚫 Enter at least two finite, comma-separated numeric bin edges.")
+        return
+
+    try:
+        if feature_b == "None":
+            stats = cube.rates(feature_a, edges_a, include_lowest=True)
+        else:
+            stats = cube.rates_2d(feature_a, edges_a, feature_b, edges_b, include_lowest=True)
+    except ValueError as e:
+        st.warning(f"🚫 {e}")
+        return
+
+    if feature_b == "None":
+        fig = px.line(stats, x="Bin", y="DiabetesRate", markers=True, hover_data=["SampleSize", "NumDiabetes"],
+                      error_y=stats['CI_upper'] - stats['DiabetesRate'],
+                      error_y_minus=stats['DiabetesRate'] - stats['CI_lower'],
+                      labels={"Bin": feature_a, "DiabetesRate": "Diabetes Rate"},
+                      title=f"Diabetes Rate by {feature_a} (95% Wilson CI)")
+        st.plotly_chart(fig, use_container_width=True)
+        st.dataframe(stats, use_container_width=True)
+    else:
+        fig = px.imshow(stats["DiabetesRate"], text_auto=".2f", color_continuous_scale="YlOrRd", aspect="auto",
+                        labels={"x": feature_b, "y": feature_a, "color": "Rate"},
+                        title=f"Diabetes Rate by {feature_a} and {feature_b}")
+        st.plotly_chart(fig, use_container_width=True)
+        if not cube.pair_is_exact(feature_a, feature_b):
+            st.caption("ℹ️ High-cardinality feature: bin edges are snapped to the nearest quantile cell.")
+        with st.expander("📋 Sample sizes and 95% Wilson intervals"):
+            st.markdown("**Sample size**")
+            st.dataframe(stats["SampleSize"], use_container_width=True)
+            st.markdown("**CI lower**")
+            st.dataframe(stats["CI_lower"].round(3), use_container_width=True)
+            st.markdown("**CI upper**")
+            st.dataframe(stats["CI_upper"].round(3), use_container_width=True)
+
+
+def build_overview_figures(df, cube):
+    # Population-level figures: identical for every user until the data changes
+    df = session_frame(df)
+
+# Map numeric outcomes to labels
+    df["DiabetesStatus"] = df["Outcome"].map({0: "No Diabetes", 1: "Diabetes"})
+
+# Bar chart with labeled X-axis
+    fig_outcome = px.histogram(df, x="DiabetesStatus", color="DiabetesStatus", barmode="group",
+                           color_discrete_map={"No Diabetes": '#0096FF', "Diabetes": '#e74c3c'},
+                           labels={"DiabetesStatus": "Diabetes Status", "count": "Count"})
+    fig_outcome.update_layout(title="Diabetes Outcome Count", height=300,
+                          xaxis_title="Diabetes Status", yaxis_title="Count", showlegend=False)
+
+# Pie chart (already correctly labeled)
+    pie_data = df["DiabetesStatus"].value_counts()
+    fig_pie = px.pie(pie_data, values=pie_data.values, names=pie_data.index,
+                 color=pie_data.index,
+                 color_discrete_map={"No Diabetes": "#0096FF", "Diabetes": "#e74c3c"})
+    fig_pie.update_layout(title="Diabetes Outcome Ratio", height=300)
+
+    # --- Feature distributions ---
+    fig1 = px.histogram(df, x="Glucose", color="Outcome", nbins=40,
+                        color_discrete_sequence=["#1f77b4", "#ff7f0e"])
+    fig1.update_layout(title="Glucose Distribution", height=250)
+    fig2 = px.histogram(df, x="BMI", color="Outcome", nbins=40,
+                        color_discrete_sequence=["#1f77b4", "#ff7f0e"])
+    fig2.update_layout(title="BMI Distribution", height=250)
+    fig3 = px.histogram(df, x="Insulin", color="Outcome", nbins=40,
+                        color_discrete_sequence=["#1f77b4", "#ff7f0e"])
+    fig3.update_layout(title="Insulin Distribution", height=250)
+
+    # --- Rate trends ---
+    age_bins = [20, 30, 40, 50, 100]
+    age_labels = ["20-29", "30-39", "40-49", "50+"]
+    age_diabetes_rate = cube.rates("Age", age_bins, labels=age_labels, include_lowest=True)
+    age_diabetes_rate.rename(columns={"Bin": "AgeGroup"}, inplace=True)
+
+    fig_age = px.line(age_diabetes_rate, x="AgeGroup", y="DiabetesRate", markers=True, title="By Age Group",
+                      error_y=age_diabetes_rate['CI_upper'] - age_diabetes_rate['DiabetesRate'],
+                      error_y_minus=age_diabetes_rate['DiabetesRate'] - age_diabetes_rate['CI_lower'])
+    fig_age.update_traces(line=dict(color='green', width=3))
+
+    pregnancy_stats = cube.rates_by_value("Pregnancies").rename(columns={"Bin": "Pregnancies"})
+    fig_preg = px.line(pregnancy_stats, x="Pregnancies", y="DiabetesRate", markers=True, title="By Pregnancies")
+
+    bmi_bins = [0, 18.5, 25, 30, 35, 50, 70]
+    bmi_labels = ["Underweight", "Normal", "Overweight", "Obese I", "Obese II", "Severe Obese"]
+    bmi_diabetes_rate = cube.rates("BMI", bmi_bins, labels=bmi_labels, right=False)
+    bmi_diabetes_rate.rename(columns={"Bin": "BMICategory"}, inplace=True)
+    fig_bmi = px.line(bmi_diabetes_rate, x="BMICategory", y="DiabetesRate", markers=True, title="By BMI Category")
+    fig_bmi.update_traces(line=dict(color='orange', width=3))
+
+    # --- 3D views ---
+    fig_3d = px.scatter_3d(df, x="Age", y="BMI", z="Glucose", color="DiabetesStatus",
+                               color_discrete_map={ "No Diabetes": "#1f77b4", "Diabetes": "#d62728"},      # vivid red
+                           opacity=0.7, size_max=1, title="Age, BMI, Glucose")
+    fig_3d.update_traces(marker=dict(size=3))  # smaller than default
+    fig_3d.update_layout(
+        scene=dict(
+        xaxis_title="Age",
+        yaxis_title="BMI",
+        zaxis_title="Glucose",
+        aspectmode='cube'
+         )
+     )
+
+    pivot_table = cube.rates_2d('Age', np.arange(20, 80, 10), 'BMI', np.arange(15, 50, 5))['DiabetesRate']
+    fig_surface = go.Figure(data=[go.Surface(
+        z=pivot_table.values,
+        x=[str(i) for i in pivot_table.columns],
+        y=[str(i) for i in pivot_table.index],
+        colorscale='Viridis')])
+    fig_surface.update_layout(title="Surface: Age & BMI",
+                              scene=dict(xaxis_title="BMI", yaxis_title="Age", zaxis_title="Rate"))
+
+    pivot_gluc = cube.rates_2d('Age', np.arange(20, 80, 10), 'Glucose', np.arange(50, 200, 20))['DiabetesRate']
+    fig_gluc = go.Figure(data=[go.Surface(
+        z=pivot_gluc.values,
+        x=[str(i) for i in pivot_gluc.columns],
+        y=[str(i) for i in pivot_gluc.index],
+        colorscale='Plasma')])
+    fig_gluc.update_layout(title="Surface: Age & Glucose",
+                           scene=dict(xaxis_title="Glucose", yaxis_title="Age", zaxis_title="Rate"))
+
+    return {
+        "outcome_count": fig_outcome,
+        "outcome_ratio": fig_pie,
+        "dist_glucose": fig1,
+        "dist_bmi": fig2,
+        "dist_insulin": fig3,
+        "trend_age": fig_age,
+        "trend_pregnancies": fig_preg,
+        "trend_bmi": fig_bmi,
+        "scatter_3d": fig_3d,
+        "surface_bmi": fig_surface,
+        "surface_glucose": fig_gluc,
+    }
 
 
 def render_overview(df):
     st.markdown("## 📊 Diabetes Dashboard Overview")
     st.markdown("#### _Understand the population distribution, outcomes, and clinical patterns._")
 
-    features = ['Glucose', 'BloodPressure', 'SkinThickness', 'Insulin', 'BMI', 'Age']
-
     # --- Metrics Row ---
     kpi1, kpi2, kpi3, kpi4 = st.columns(4)
     with kpi1:
@@ -23,33 +192,20 @@ def render_overview(df):
     with kpi4:
         st.metric("📏 Avg BMI", f"{df['BMI'].mean():.1f}")
 
+    cube = get_rate_cube()
+
+    # Serve pre-rendered figures only for the data the KPIs and cube were built from
+    snapshot = load_snapshot("overview", version=get_data_version()) if snapshot_mode_enabled() else None
+    figures = snapshot["figures"] if snapshot is not None else build_overview_figures(df, cube)
+
     st.markdown("---")
 
 # --- Bar & Pie Charts Row ---
     col_bar, col_pie = st.columns(2)
-
-# Map numeric outcomes to labels
-    df["DiabetesStatus"] = df["Outcome"].map({0: "No Diabetes", 1: "Diabetes"})
-
-# Bar chart with labeled X-axis
-    fig_outcome = px.histogram(df, x="DiabetesStatus", color="DiabetesStatus", barmode="group",
-                           color_discrete_map={"No Diabetes": '#0096FF', "Diabetes": '#e74c3c'},
-                           labels={"DiabetesStatus": "Diabetes Status", "count": "Count"})
-    fig_outcome.update_layout(title="Diabetes Outcome Count", height=300,
-                          xaxis_title="Diabetes Status", yaxis_title="Count", showlegend=False)
-
-# Pie chart (already correctly labeled)
-    pie_data = df["DiabetesStatus"].value_counts()
-    fig_pie = px.pie(pie_data, values=pie_data.values, names=pie_data.index,
-                 color=pie_data.index,
-                 color_discrete_map={"No Diabetes": "#0096FF", "Diabetes": "#e74c3c"})
-    fig_pie.update_layout(title="Diabetes Outcome Ratio", height=300)
-
-# Display charts
     with col_bar:
-     st.plotly_chart(fig_outcome, use_container_width=True)
+     st.plotly_chart(figures["outcome_count"], use_container_width=True)
     with col_pie:
-      st.plotly_chart(fig_pie, use_container_width=True)
+      st.plotly_chart(figures["outcome_ratio"], use_container_width=True)
 
 
     st.markdown("---")
@@ -57,110 +213,37 @@ def render_overview(df):
 
     dist1, dist2, dist3 = st.columns(3)
     with dist1:
-        fig1 = px.histogram(df, x="Glucose", color="Outcome", nbins=40,
-                            color_discrete_sequence=["#1f77b4", "#ff7f0e"])
-        fig1.update_layout(title="Glucose Distribution", height=250)
-        st.plotly_chart(fig1, use_container_width=True)
+        st.plotly_chart(figures["dist_glucose"], use_container_width=True)
     with dist2:
-        fig2 = px.histogram(df, x="BMI", color="Outcome", nbins=40,
-                            color_discrete_sequence=["#1f77b4", "#ff7f0e"])
-        fig2.update_layout(title="BMI Distribution", height=250)
-        st.plotly_chart(fig2, use_container_width=True)
+        st.plotly_chart(figures["dist_bmi"], use_container_width=True)
     with dist3:
-        fig3 = px.histogram(df, x="Insulin", color="Outcome", nbins=40,
-                            color_discrete_sequence=["#1f77b4", "#ff7f0e"])
-        fig3.update_layout(title="Insulin Distribution", height=250)
-        st.plotly_chart(fig3, use_container_width=True)
+        st.plotly_chart(figures["dist_insulin"], use_container_width=True)
 
     st.markdown("---")
     st.markdown("#### 📈 Diabetes Rate Trends")
 
-    age_bins = [20, 30, 40, 50, 100]
-    age_labels = ["20-29", "30-39", "40-49", "50+"]
-    df["AgeGroup"] = pd.cut(df["Age"], bins=age_bins, labels=age_labels, right=True, include_lowest=True)
-    age_diabetes_rate = df.groupby("AgeGroup")["Outcome"].agg(['mean', 'count', 'sum']).reset_index()
-    age_diabetes_rate.columns = ["AgeGroup", "DiabetesRate", "SampleSize", "NumDiabetes"]
-
-    # Compute 95% Confidence Interval
-    age_diabetes_rate['CI_lower'], age_diabetes_rate['CI_upper'] = proportion_confint(
-        count=age_diabetes_rate['NumDiabetes'],
-        nobs=age_diabetes_rate['SampleSize'],
-        alpha=0.05,
-        method='wilson')
-
-    fig_age = px.line(age_diabetes_rate, x="AgeGroup", y="DiabetesRate", markers=True, title="By Age Group",
-                      error_y=age_diabetes_rate['CI_upper'] - age_diabetes_rate['DiabetesRate'],
-                      error_y_minus=age_diabetes_rate['DiabetesRate'] - age_diabetes_rate['CI_lower'])
-    fig_age.update_traces(line=dict(color='green', width=3))
-
-    pregnancy_stats = df.groupby("Pregnancies")["Outcome"].mean().reset_index()
-    pregnancy_stats.rename(columns={"Outcome": "DiabetesRate"}, inplace=True)
-    fig_preg = px.line(pregnancy_stats, x="Pregnancies", y="DiabetesRate", markers=True, title="By Pregnancies")
-
-    bmi_bins = [0, 18.5, 25, 30, 35, 50, 70]
-    bmi_labels = ["Underweight", "Normal", "Overweight", "Obese I", "Obese II", "Severe Obese"]
-    df["BMICategory"] = pd.cut(df["BMI"], bins=bmi_bins, labels=bmi_labels, right=False)
-    bmi_diabetes_rate = df.groupby("BMICategory")["Outcome"].mean().reset_index()
-    bmi_diabetes_rate.rename(columns={"Outcome": "DiabetesRate"}, inplace=True)
-    fig_bmi = px.line(bmi_diabetes_rate, x="BMICategory", y="DiabetesRate", markers=True, title="By BMI Category")
-    fig_bmi.update_traces(line=dict(color='orange', width=3))
-
     row1, row2, row3 = st.columns(3)
     with row1:
-        st.plotly_chart(fig_age, use_container_width=True)
+        st.plotly_chart(figures["trend_age"], use_container_width=True)
     with row2:
-        st.plotly_chart(fig_preg, use_container_width=True)
+        st.plotly_chart(figures["trend_pregnancies"], use_container_width=True)
     with row3:
-        st.plotly_chart(fig_bmi, use_container_width=True)
+        st.plotly_chart(figures["trend_bmi"], use_container_width=True)
+
+    st.markdown("---")
+    render_slice_explorer(cube)
 
     st.markdown("---")
     st.markdown("#### 🌐 3D Risk Views")
 
     col1, col2, col3 = st.columns(3)
-
     with col1:
-        df["DiabetesLabel"] = df["Outcome"].map({0: "No Diabetes", 1: "Diabetes"})
-        fig_3d = px.scatter_3d(df, x="Age", y="BMI", z="Glucose", color="DiabetesLabel",
-                                   color_discrete_map={ "No Diabetes": "#1f77b4", "Diabetes": "#d62728"},      # vivid red
-                               opacity=0.7, size_max=1, title="Age, BMI, Glucose")
-        fig_3d.update_traces(marker=dict(size=3))  # smaller than default
-        fig_3d.update_layout(
-            scene=dict(
-            xaxis_title="Age",
-            yaxis_title="BMI",
-            zaxis_title="Glucose",
-            aspectmode='cube'
-             )
-         )
-        st.plotly_chart(fig_3d, use_container_width=True)
-
+        st.plotly_chart(figures["scatter_3d"], use_container_width=True)
     with col2:
-        df['AgeBin'] = pd.cut(df['Age'], bins=np.arange(20, 80, 10))
-        df['BMIBin'] = pd.cut(df['BMI'], bins=np.arange(15, 50, 5))
-        pivot_table = df.pivot_table(index='AgeBin', columns='BMIBin', values='Outcome', aggfunc='mean')
-        fig_surface = go.Figure(data=[go.Surface(
-            z=pivot_table.values,
-            x=[str(i) for i in pivot_table.columns],
-            y=[str(i) for i in pivot_table.index],
-            colorscale='Viridis')])
-        fig_surface.update_layout(title="Surface: Age & BMI",
-                                  scene=dict(xaxis_title="BMI", yaxis_title="Age", zaxis_title="Rate"))
-        st.plotly_chart(fig_surface, use_container_width=True)
-
+        st.plotly_chart(figures["surface_bmi"], use_container_width=True)
     with col3:
-        df['GlucoseBin'] = pd.cut(df['Glucose'], bins=np.arange(50, 200, 20))
-        df['AgeBin'] = pd.cut(df['Age'], bins=np.arange(20, 80, 10))
-        pivot_gluc = df.pivot_table(index='AgeBin', columns='GlucoseBin', values='Outcome', aggfunc='mean')
-        fig_gluc = go.Figure(data=[go.Surface(
-            z=pivot_gluc.values,
-            x=[str(i) for i in pivot_gluc.columns],
-            y=[str(i) for i in pivot_gluc.index],
-            colorscale='Plasma')])
-        fig_gluc.update_layout(title="Surface: Age & Glucose",
-                               scene=dict(xaxis_title="Glucose", yaxis_title="Age", zaxis_title="Rate"))
-        st.plotly_chart(fig_gluc, use_container_width=True)
-        
+        st.plotly_chart(figures["surface_glucose"], use_container_width=True)
+
     with st.expander("📋 View Summary Statistics"):
         styled_df = df.describe().T.style.background_gradient(cmap="PuBu")
         st.dataframe(styled_df, height=350)
-
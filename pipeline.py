@@ -0,0 +1,117 @@
+import hashlib
+import json
+
+import numpy as np
+
+# Bump when the transform itself changes, so stored pipelines are not mixed up
+PIPELINE_VERSION = 1
+
+
+class FeaturePipeline:
+    """Fitted preprocessing shared by training, the UI and batch scoring.
+
+    Zeros in `zero_as_missing` columns (and NaNs anywhere) are replaced with
+    the training medians. `transform` accepts a single row (dict or 1D array),
+    a DataFrame or a 2D NumPy block and always runs the same vectorized code
+    on a float64 array, so one patient and a million rows are treated alike.
+    """
+
+    def __init__(self, features, zero_as_missing=None, bounds=None):
+        self.features = list(features)
+        self.zero_as_missing = list(zero_as_missing or [])
+        self.bounds = dict(bounds or {})
+        self.medians_ = None
+        self._zero_idx = np.array([self.features.index(f) for f in self.zero_as_missing], dtype=np.intp)
+
+    def _as_array(self, X):
+        if isinstance(X, dict):
+            X = [X[f] for f in self.features]
+        elif hasattr(X, "columns"):
+            X = X[self.features].to_numpy(dtype=np.float64)
+        A = np.array(X, dtype=np.float64, ndmin=2)
+        if A.shape[1] != len(self.features):
+            raise ValueError(f"Expected {len(self.features)} features, got {A.shape[1]}")
+        return A
+
+    def _missing(self, A):
+        mask = np.isnan(A)
+        mask[:, self._zero_idx] |= A[:, self._zero_idx] == 0
+        return mask
+
+    def fit(self, X):
+        A = self._as_array(X)
+        A[self._missing(A)] = np.nan
+        self.medians_ = np.nanmedian(A, axis=0)
+        return self
+
+    def transform(self, X):
+        """Imputed float64 array of shape (n_rows, n_features)."""
+        if self.medians_ is None:
+            raise RuntimeError("FeaturePipeline must be fitted before transform")
+        A = self._as_array(X)
+        return np.where(self._missing(A), self.medians_, A)
+
+    def out_of_bounds(self, X):
+        """Boolean mask of values outside the accepted input range (NaN counts as out)."""
+        A = self._as_array(X)
+        lower = np.array([self.bounds.get(f, (-np.inf, np.inf))[0] for f in self.features])
+        upper = np.array([self.bounds.get(f, (-np.inf, np.inf))[1] for f in self.features])
+        return ~((A >= lower) & (A <= upper))
+
+    def to_dict(self):
+        return {
+            "version": PIPELINE_VERSION,
+            "features": self.features,
+            "zero_as_missing": self.zero_as_missing,
+            "bounds": {f: list(b) for f, b in self.bounds.items()},
+            "medians": None if self.medians_ is None else self.medians_.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if data["version"] != PIPELINE_VERSION:
+            raise ValueError(f"Unsupported pipeline version: {data['version']}")
+        pipeline = cls(data["features"], data["zero_as_missing"],
+                       {f: tuple(b) for f, b in data["bounds"].items()})
+        if data["medians"] is not None:
+            pipeline.medians_ = np.asarray(data["medians"], dtype=np.float64)
+        return pipeline
+
+    def save(self, path):
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    def fingerprint(self):
+        """Short hash of the fitted state, for comparing two pipelines."""
+        return hashlib.sha256(json.dumps(self.to_dict(), sort_keys=True).encode()).hexdigest()[:12]
+
+
+def attach_pipeline(model, pipeline):
+    """Store `pipeline` on `model` together with the serialized state it was trained with.
+
+    The state travels with the model (e.g. when it is pickled), so a scorer
+    can always rebuild the exact pipeline and detect a drifted live one.
+    """
+    model.pipeline_ = pipeline
+    model.pipeline_state_ = pipeline.to_dict()
+    return model
+
+
+def scoring_pipeline(model):
+    """The pipeline to transform inputs for `model`, after checking it is the one it was trained with.
+
+    Raises ValueError if the stored state was written by another PIPELINE_VERSION.
+    """
+    state = getattr(model, "pipeline_state_", None)
+    if state is None:
+        raise RuntimeError("Model has no feature pipeline attached")
+    trained = FeaturePipeline.from_dict(state)
+    pipeline = getattr(model, "pipeline_", trained)
+    if pipeline.fingerprint() != trained.fingerprint():
+        raise RuntimeError("Feature pipeline does not match the one the model was trained with")
+    return pipeline
@@ -1,10 +1,14 @@
 import streamlit as st
-import numpy as np
 import qrcode
 from io import BytesIO
 from streamlit_lottie import st_lottie
 import json
 from recommendation import render_recommendation
+from calibration import calibrated_proba
+from risk import risk_band
+from uncertainty import risk_interval
+from pipeline import scoring_pipeline
+from resources import get_ensemble
 
 
 def load_lottie(filepath):
@@ -14,13 +18,8 @@ def load_lottie(filepath):
 def render_predict(df, features, model):
     st.markdown("## 🔬 Diabetes Risk Prediction")
 
-    bounds = {
-        "Glucose": (50.0, 300.0),
-        "BloodPressure": (40.0, 200.0),
-        "Insulin": (15.0, 900.0),
-        "BMI": (10.0, 70.0),
-        "Age": (1.0, 120.0)
-    }
+    pipeline = scoring_pipeline(model)
+    bounds = pipeline.bounds
 
     # Create two side-by-side columns
     col_form, col_result = st.columns([1.2, 1])
@@ -45,14 +44,13 @@ def render_predict(df, features, model):
                     except ValueError:
                         manual_input[feature] = None  # Invalid input for now
 
+            show_uncertainty = st.checkbox("Show uncertainty interval", value=False)
             submitted = st.form_submit_button("🚀 Predict")
 
     if submitted:
         # Validation
-        invalid_fields = [
-            f for f in features
-            if manual_input[f] is None or not bounds[f][0] <= manual_input[f] <= bounds[f][1]
-        ]
+        out_of_bounds = pipeline.out_of_bounds(manual_input)[0]  # missing values count as out of bounds
+        invalid_fields = [f for f, bad in zip(pipeline.features, out_of_bounds) if bad]
         if invalid_fields:
             st.warning("🚫 Some input values are missing or out of bounds.")
             st.markdown(f"**Check fields:** {', '.join(invalid_fields)}")
@@ -61,13 +59,16 @@ def render_predict(df, features, model):
         # Store input in session state
         st.session_state['user_input'] = manual_input
 
-        manual_array = np.array(list(manual_input.values())).reshape(1, -1)
-        manual_prob = model.predict_proba(manual_array)[0][1]
-        manual_class = model.predict(manual_array)[0]
+        manual_array = pipeline.transform(manual_input)
+        manual_prob = calibrated_proba(model, manual_array)[0]
+        manual_class = int(manual_prob >= 0.5)
         st.session_state['user_prediction'] = {
             'class': manual_class,
             'prob': manual_prob
         }
+        if show_uncertainty:
+            lower, upper = risk_interval(get_ensemble(), manual_array, model=model)
+            st.session_state['user_prediction']['interval'] = (lower[0], upper[0])
 
         # Show result in right column
         with col_result:
@@ -83,10 +84,15 @@ def render_predict(df, features, model):
             </div>
             """, unsafe_allow_html=True)
 
-            if manual_prob >= 0.7:
+            if show_uncertainty:
+                lower, upper = st.session_state['user_prediction']['interval']
+                st.caption(f"95% interval: {lower*100:.1f}% – {upper*100:.1f}%")
+
+            band = risk_band(manual_prob)
+            if band == "high":
                 st.error("🟥 High Risk")
                 st_lottie(load_lottie("high_risk.json"), height=120)
-            elif manual_prob >= 0.4:
+            elif band == "moderate":
                 st.warning("🟧 Moderate Risk")
                 st_lottie(load_lottie("medium_risk.json"), height=120)
             else:
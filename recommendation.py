@@ -1,10 +1,12 @@
 import streamlit as st
+from risk import risk_band
 
 def render_recommendation(probability):
     st.subheader("📌 Personalized Recommendations")
     st.markdown("_Lifestyle and wellness tips based on your risk level._")
 
-    if probability >= 0.7:
+    band = risk_band(probability)
+    if band == "high":
         st.error("🟥 **High Risk**: You may be at significant risk of diabetes.")
         st.markdown("""
         - ✅ **Consult a healthcare provider** immediately for a full diagnostic assessment.
@@ -13,7 +15,7 @@ def render_recommendation(probability):
         - 🧂 Reduce sodium and processed food intake.
         - 📉 Track **weight, glucose, and BMI** weekly.
         """)
-    elif probability >= 0.4:
+    elif band == "moderate":
         st.warning("🟧 **Moderate Risk**: You show some signs of elevated risk.")
         st.markdown("""
         - 🍽 Maintain a **balanced diet** with controlled carbs and sugars.
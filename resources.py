@@ -0,0 +1,145 @@
+"""Process-wide shared resources.
+
+Everything here is built once per server process with `st.cache_resource`
+and shared by every session: the cleaned dataset (backed by read-only
+arrays) with its fitted feature pipeline, the calibrated model, the SHAP
+explainer, the bootstrap ensemble and the subgroup rate cube. The shared
+frame itself never leaves this module; `get_dataset` hands out a
+`session_frame` view, which shares column buffers with the original until
+a column is written, so adding or replacing columns stays per session.
+`get_data_version` names the CSV contents all of them were built from.
+"""
+import io
+import sys
+import types
+
+import numpy as np
+import pandas as pd
+import shap
+import streamlit as st
+from sklearn.linear_model import LogisticRegression
+
+from calibration import fit_calibration
+from dataset import DATA_PATH, load_dataset
+from pipeline import attach_pipeline
+from snapshot import content_version
+from subgroups import RateCube
+from uncertainty import fit_bootstrap_ensemble
+
+# Copy-on-write is the default from pandas 3; opt in on older versions
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+# name -> shared object, for memory accounting of what has been built so far
+_registry = {}
+
+
+def _register(name, obj):
+    _registry[name] = obj
+    return obj
+
+
+def _freeze(df):
+    # Rebuild the frame on read-only copies of its columns so any in-place
+    # write raises instead of leaking into other sessions.
+    columns = {}
+    for col in df.columns:
+        values = df[col].to_numpy(copy=True)
+        values.flags.writeable = False
+        columns[col] = values
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+
+@st.cache_resource(show_spinner=False)
+def _load():
+    # Version and frame come from the same bytes, even if the CSV changes meanwhile
+    with open(DATA_PATH, "rb") as f:
+        raw = f.read()
+    df, features, pipeline = load_dataset(io.BytesIO(raw))
+    return _register("dataset", _freeze(df)), features, _register("pipeline", pipeline), content_version(raw)
+
+
+def get_dataset():
+    """Per-caller copy-on-write view of the shared cleaned dataset."""
+    df, features, _, _ = _load()
+    return session_frame(df), features
+
+
+def get_pipeline():
+    return _load()[2]
+
+
+def get_data_version():
+    """Snapshot version of the data every shared resource was built from."""
+    return _load()[3]
+
+
+@st.cache_resource(show_spinner="Training model...")
+def get_model():
+    df, features, _, _ = _load()
+    # Train on the pipeline's output array, the same representation every scoring path uses
+    X, y = df[features].to_numpy(), df['Outcome'].to_numpy()
+    model = LogisticRegression(max_iter=1000)
+    model.fit(X, y)
+    fit_calibration(model, X, y, method="sigmoid")
+    # Versioned together: scoring code reads the pipeline from the model it scores with
+    attach_pipeline(model, get_pipeline())
+    return _register("model", model)
+
+
+@st.cache_resource(show_spinner="Preparing explainer...")
+def get_explainer():
+    df, features, _, _ = _load()
+    return _register("explainer", shap.Explainer(get_model(), df[features]))
+
+
+@st.cache_resource(show_spinner="Training bootstrap ensemble...")
+def get_ensemble():
+    df, features, _, _ = _load()
+    return _register("ensemble", fit_bootstrap_ensemble(df[features].values, df['Outcome'].values))
+
+
+@st.cache_resource(show_spinner=False)
+def get_rate_cube():
+    df, _, _, _ = _load()
+    return _register("rate_cube", RateCube.for_frame(df))
+
+
+def session_frame(df):
+    """Per-session view of a shared frame; columns are copied only when written."""
+    return df.copy(deep=False)
+
+
+def deep_sizeof(obj, _seen=None):
+    """Approximate bytes held by `obj`, counting each buffer once."""
+    if _seen is None:
+        _seen = set()
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+
+    if isinstance(obj, (pd.DataFrame, pd.Series)):
+        usage = obj.memory_usage(deep=True, index=True)
+        return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+    if isinstance(obj, np.ndarray):
+        base = obj.base if isinstance(obj.base, np.ndarray) else None
+        if base is not None:
+            return deep_sizeof(base, _seen)
+        return obj.nbytes
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(deep_sizeof(k, _seen) + deep_sizeof(v, _seen) for k, v in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return sys.getsizeof(obj) + sum(deep_sizeof(item, _seen) for item in obj)
+    if hasattr(obj, "__dict__") and not isinstance(obj, (type, types.ModuleType)):
+        return sys.getsizeof(obj) + deep_sizeof(vars(obj), _seen)
+    return sys.getsizeof(obj)
+
+
+def resource_memory():
+    """Bytes held by each shared resource built so far in this process.
+
+    Buffers shared between resources (e.g. the model referenced by the
+    explainer) are attributed to the resource that was built first.
+    """
+    seen = set()
+    return {name: deep_sizeof(obj, seen) for name, obj in _registry.items()}
@@ -0,0 +1,21 @@
+import numpy as np
+
+# Single source of truth for the risk band cut-offs (applied to calibrated probabilities)
+MODERATE_THRESHOLD = 0.4
+HIGH_THRESHOLD = 0.7
+
+RISK_BANDS = ["low", "moderate", "high"]
+
+
+def risk_bands(probabilities):
+    """Vectorized band lookup: returns an array of 'low' / 'moderate' / 'high'."""
+    probabilities = np.asarray(probabilities, dtype=float)
+    if np.isnan(probabilities).any():
+        raise ValueError("Cannot assign a risk band to a missing probability")
+    idx = np.digitize(probabilities, [MODERATE_THRESHOLD, HIGH_THRESHOLD])
+    return np.asarray(RISK_BANDS, dtype=object)[idx]
+
+
+def risk_band(probability):
+    """Band for a single probability."""
+    return risk_bands([probability])[0]
@@ -0,0 +1,182 @@
+"""Headless pre-rendering of the population-level dashboards.
+
+Build (or refresh) the snapshot for the current diabetes.csv with:
+
+    python snapshot.py
+
+Snapshots live in snapshots/<data version>/, where the version is derived
+from the CSV contents and SNAPSHOT_FORMAT, so editing the data or the
+figure code produces a new directory instead of serving stale charts.
+Set GLUCOTRACK_SNAPSHOTS=1 to make the app serve them; in that mode a
+missing snapshot is built on the first request after the data changes.
+"""
+import hashlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from datetime import datetime
+
+import plotly.io as pio
+import streamlit as st
+
+from dataset import DATA_PATH
+
+SNAPSHOT_ROOT = "snapshots"
+
+# Bump when the figure-building code changes so old snapshots are not reused
+SNAPSHOT_FORMAT = 1
+
+# Serializes lazy builds triggered by concurrent sessions of one server process
+_build_lock = threading.Lock()
+
+
+def snapshot_mode_enabled():
+    return os.environ.get("GLUCOTRACK_SNAPSHOTS", "0") == "1"
+
+
+def content_version(raw):
+    """Snapshot version of the CSV bytes `raw`."""
+    return f"{hashlib.sha256(raw).hexdigest()[:12]}-f{SNAPSHOT_FORMAT}"
+
+
+# (path, mtime, size) -> version, so serving does not rehash the CSV per request
+_version_cache = {}
+
+
+def data_version(path=DATA_PATH):
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    if key not in _version_cache:
+        with open(path, "rb") as f:
+            _version_cache[key] = content_version(f.read())
+    return _version_cache[key]
+
+
+def snapshot_dir(path=DATA_PATH, root=SNAPSHOT_ROOT):
+    return os.path.join(root, data_version(path))
+
+
+def _render_dashboards(raw):
+    # Imported lazily: overview itself imports this module
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from dataset import load_dataset
+    from diabetes_charts import build_figures, build_heatmap, load_chart_data
+    from overview import build_overview_figures
+    from subgroups import RateCube
+
+    # Parsed from the bytes the version was computed from, never re-read from disk
+    df, _, _ = load_dataset(io.BytesIO(raw))
+    chart_df = load_chart_data(io.BytesIO(raw))
+    heatmap = build_heatmap(chart_df)
+    return {
+        "overview": (build_overview_figures(df, RateCube.for_frame(df)), {}),
+        "charts": (build_figures(chart_df), {"heatmap": heatmap}),
+    }, plt
+
+
+def _write_snapshot(staging, target, path, dashboards, plt):
+    manifest = {
+        "version": os.path.basename(target),
+        "source": os.path.abspath(path),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "dashboards": {},
+    }
+    for name, (figures, images) in dashboards.items():
+        out_dir = os.path.join(staging, name)
+        os.makedirs(out_dir)
+        for key, fig in figures.items():
+            with open(os.path.join(out_dir, f"{key}.json"), "w") as f:
+                f.write(fig.to_json())
+            fig.write_html(os.path.join(out_dir, f"{key}.html"), include_plotlyjs="cdn")
+        for key, fig in images.items():
+            fig.savefig(os.path.join(out_dir, f"{key}.png"), bbox_inches="tight")
+            plt.close(fig)
+        manifest["dashboards"][name] = {"figures": list(figures), "images": list(images)}
+
+    # Manifest last: a directory without one is never served
+    with open(os.path.join(staging, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+
+def build_snapshot(path=DATA_PATH, root=SNAPSHOT_ROOT, force=False):
+    """Render every dashboard for the data at `path`; returns the snapshot directory.
+
+    Sessions in this process build one at a time; each build writes into its
+    own staging directory and is renamed into place, so a concurrent build
+    from another process either wins the rename or is discarded.
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    target = os.path.join(root, content_version(raw))
+    with _build_lock:
+        if os.path.exists(os.path.join(target, "manifest.json")) and not force:
+            return target
+
+        dashboards, plt = _render_dashboards(raw)
+        os.makedirs(root, exist_ok=True)
+        staging = tempfile.mkdtemp(dir=root, prefix=f".{os.path.basename(target)}.")
+        os.chmod(staging, 0o755)
+        try:
+            _write_snapshot(staging, target, path, dashboards, plt)
+            if force and os.path.exists(target):
+                # Move the old snapshot aside first; renaming onto a non-empty directory fails
+                retired = tempfile.mkdtemp(dir=root, prefix=".retired.")
+                os.replace(target, os.path.join(retired, "old"))
+                shutil.rmtree(retired, ignore_errors=True)
+            try:
+                os.rename(staging, target)
+            except OSError:
+                # Another build published first; keep its snapshot
+                if not os.path.exists(os.path.join(target, "manifest.json")):
+                    raise
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+    return target
+
+
+@st.cache_resource(show_spinner=False)
+def _read_snapshot(target, dashboard):
+    with open(os.path.join(target, "manifest.json")) as f:
+        entry = json.load(f)["dashboards"][dashboard]
+    base = os.path.join(target, dashboard)
+    figures = {}
+    for key in entry["figures"]:
+        with open(os.path.join(base, f"{key}.json")) as f:
+            figures[key] = pio.from_json(f.read())
+    images = {}
+    for key in entry["images"]:
+        with open(os.path.join(base, f"{key}.png"), "rb") as f:
+            images[key] = f.read()
+    return {"figures": figures, "images": images}
+
+
+def load_snapshot(dashboard, path=DATA_PATH, root=SNAPSHOT_ROOT, build_missing=True, version=None):
+    """Figures and images of `dashboard` for the current data.
+
+    Pass `version` (see `content_version`) to pin the snapshot to the data a
+    caller has already loaded; if `path` has since changed to other contents,
+    None is returned instead of charts for different data. A missing snapshot
+    (e.g. right after diabetes.csv changed) is rendered once on first request
+    unless `build_missing` is False, in which case None is returned and the
+    caller recomputes live.
+    """
+    target = os.path.join(root, version) if version else snapshot_dir(path, root)
+    if not os.path.exists(os.path.join(target, "manifest.json")):
+        if not build_missing or (version and data_version(path) != version):
+            return None
+        built = build_snapshot(path, root)
+        if version and built != target:
+            return None
+        target = built
+    return _read_snapshot(target, dashboard)
+
+
+if __name__ == "__main__":
+    force = "--force" in sys.argv[1:]
+    print(build_snapshot(force=force))
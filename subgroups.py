@@ -0,0 +1,217 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Two-sided 95% normal quantile used for the Wilson intervals
+Z_95 = 1.959963984540054
+
+# Cells per feature axis of the 2D count cubes; features with more distinct
+# values are quantised to this many quantile cells
+MAX_GRID_LEVELS = 512
+
+# 2D summed-area tables kept at once (least recently used are dropped)
+MAX_CACHED_PAIRS = 8
+
+
+def wilson_interval(successes, nobs, z=Z_95):
+    """Vectorized Wilson score interval; NaN where a bin is empty."""
+    successes = np.asarray(successes, dtype=float)
+    nobs = np.asarray(nobs, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p = successes / nobs
+        denom = 1 + z ** 2 / nobs
+        center = (p + z ** 2 / (2 * nobs)) / denom
+        half = z * np.sqrt(p * (1 - p) / nobs + z ** 2 / (4 * nobs ** 2)) / denom
+    return center - half, center + half
+
+
+def _bin_labels(edges, right):
+    fmt = lambda e: f"{e:g}"
+    if right:
+        return [f"({fmt(a)}, {fmt(b)}]" for a, b in zip(edges[:-1], edges[1:])]
+    return [f"[{fmt(a)}, {fmt(b)})" for a, b in zip(edges[:-1], edges[1:])]
+
+
+class RateCube:
+    """Exact outcome rates for arbitrary 1D/2D slices of a frame.
+
+    Each feature is encoded once against its sorted unique values, with
+    cumulative row and outcome counts per value. Any set of bin edges then
+    resolves to two `searchsorted` calls and a difference of cumulative sums,
+    so re-slicing never touches the raw rows.
+
+    Pairs of features use a lazily built 2D summed-area table over a bounded
+    grid per feature: one cell per distinct value when a feature has at most
+    MAX_GRID_LEVELS of them (exact), otherwise quantile cells, in which case
+    2D bin edges snap to the nearest cell boundary.
+    """
+
+    def __init__(self, df, features, outcome="Outcome"):
+        self.features = list(features)
+        self._y = df[outcome].to_numpy(dtype=np.float64)
+        self._levels = {}
+        self._cum_total = {}
+        self._cum_pos = {}
+        self._grid_codes = {}
+        self._grid_bounds = {}
+        self._pairs = OrderedDict()
+        self._pairs_lock = threading.Lock()
+
+        for feature in self.features:
+            values = df[feature].to_numpy(dtype=np.float64)
+            valid = ~np.isnan(values)
+            levels, codes = np.unique(values[valid], return_inverse=True)
+            full_codes = np.full(len(values), -1, dtype=np.intp)
+            full_codes[valid] = codes
+
+            total = np.bincount(codes, minlength=len(levels))
+            pos = np.bincount(codes, weights=self._y[valid], minlength=len(levels))
+            self._levels[feature] = levels
+            self._cum_total[feature] = np.concatenate([[0], np.cumsum(total)])
+            self._cum_pos[feature] = np.concatenate([[0.0], np.cumsum(pos)])
+            self._build_grid(feature, full_codes)
+
+    def _build_grid(self, feature, level_codes):
+        # Cell boundaries as positions in the level axis (0 .. n_levels)
+        n_levels = len(self._levels[feature])
+        if n_levels <= MAX_GRID_LEVELS:
+            bounds = np.arange(n_levels + 1)
+        else:
+            cum = self._cum_total[feature]
+            targets = np.linspace(0, cum[-1], MAX_GRID_LEVELS + 1)
+            bounds = np.unique(np.concatenate([[0], np.searchsorted(cum, targets[1:-1]), [n_levels]]))
+        cell_of_level = np.searchsorted(bounds, np.arange(n_levels), side="right") - 1
+        grid_codes = np.where(level_codes >= 0, cell_of_level[np.maximum(level_codes, 0)], -1)
+        self._grid_bounds[feature] = bounds
+        self._grid_codes[feature] = grid_codes.astype(np.int32)
+
+    def pair_is_exact(self, row_feature, col_feature):
+        """Whether 2D rates for this pair use the exact bin edges (no snapping)."""
+        return all(len(self._grid_bounds[f]) == len(self._levels[f]) + 1 for f in (row_feature, col_feature))
+
+    @classmethod
+    def for_frame(cls, df, outcome="Outcome"):
+        """Cube over every numeric column of `df` except the outcome."""
+        features = [col for col in df.select_dtypes("number").columns if col != outcome]
+        return cls(df, features, outcome=outcome)
+
+    def levels(self, feature):
+        return self._levels[feature]
+
+    def _bounds(self, feature, edges, right, include_lowest):
+        # Positions in the cumulative arrays delimiting each bin
+        levels = self._levels[feature]
+        edges = np.asarray(edges, dtype=np.float64)
+        if edges.ndim != 1 or len(edges) < 2:
+            raise ValueError("Bin edges must be a 1D sequence of at least two values")
+        if not np.all(np.diff(edges) > 0):
+            raise ValueError("Bin edges must increase monotonically")
+        side = "right" if right else "left"
+        lo = np.searchsorted(levels, edges[:-1], side=side)
+        hi = np.searchsorted(levels, edges[1:], side=side)
+        if right and include_lowest:
+            lo[0] = np.searchsorted(levels, edges[0], side="left")
+        return lo, hi
+
+    def _frame(self, labels, total, pos):
+        lower, upper = wilson_interval(pos, total)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rate = pos / total
+        return pd.DataFrame({
+            "Bin": labels,
+            "SampleSize": total.astype(np.int64),
+            "NumDiabetes": pos.astype(np.int64),
+            "DiabetesRate": rate,
+            "CI_lower": lower,
+            "CI_upper": upper,
+        })
+
+    def rates(self, feature, edges, labels=None, right=True, include_lowest=False):
+        """Rate, counts and Wilson CI per bin; bins follow `pd.cut` semantics."""
+        lo, hi = self._bounds(feature, edges, right, include_lowest)
+        total = self._cum_total[feature][hi] - self._cum_total[feature][lo]
+        pos = self._cum_pos[feature][hi] - self._cum_pos[feature][lo]
+        if labels is None:
+            labels = _bin_labels(edges, right)
+        return self._frame(labels, total, pos)
+
+    def rates_by_value(self, feature):
+        """Rate, counts and Wilson CI for every distinct value of `feature`."""
+        total = np.diff(self._cum_total[feature])
+        pos = np.diff(self._cum_pos[feature])
+        return self._frame(self._levels[feature], total, pos)
+
+    def _pair_table(self, row_feature, col_feature):
+        # One table per unordered pair; the other order is its transpose
+        key = tuple(sorted((row_feature, col_feature)))
+        with self._pairs_lock:
+            table = self._pairs.get(key)
+            if table is not None:
+                self._pairs.move_to_end(key)
+        if table is None:
+            first, second = key
+            rc, cc = self._grid_codes[first], self._grid_codes[second]
+            n_rows, n_cols = len(self._grid_bounds[first]) - 1, len(self._grid_bounds[second]) - 1
+            valid = (rc >= 0) & (cc >= 0)
+            flat = rc[valid].astype(np.intp) * n_cols + cc[valid]
+            size = n_rows * n_cols
+            total = np.bincount(flat, minlength=size).reshape(n_rows, n_cols)
+            pos = np.bincount(flat, weights=self._y[valid], minlength=size).reshape(n_rows, n_cols)
+            sat_total = np.zeros((n_rows + 1, n_cols + 1), dtype=np.int64)
+            sat_pos = np.zeros((n_rows + 1, n_cols + 1))
+            sat_total[1:, 1:] = total.cumsum(0).cumsum(1)
+            sat_pos[1:, 1:] = pos.cumsum(0).cumsum(1)
+            table = (sat_total, sat_pos)
+            with self._pairs_lock:
+                self._pairs[key] = table
+                while len(self._pairs) > MAX_CACHED_PAIRS:
+                    self._pairs.popitem(last=False)
+        if key != (row_feature, col_feature):
+            table = (table[0].T, table[1].T)
+        return table
+
+    def _snap(self, feature, positions):
+        # Level-axis positions -> nearest grid cell boundary (identity when exact)
+        bounds = self._grid_bounds[feature]
+        j = np.clip(np.searchsorted(bounds, positions), 1, len(bounds) - 1)
+        return np.where(positions - bounds[j - 1] <= bounds[j] - positions, j - 1, j)
+
+    def rates_2d(self, row_feature, row_edges, col_feature, col_edges,
+                 row_labels=None, col_labels=None, right=True, include_lowest=False):
+        """Cross-tabulated rates for two binned features.
+
+        Returns a dict of DataFrames ("DiabetesRate", "SampleSize", "CI_lower",
+        "CI_upper") indexed by row bins with one column per column bin. See
+        `pair_is_exact` for when edges snap to the quantile grid.
+        """
+        r_lo, r_hi = self._bounds(row_feature, row_edges, right, include_lowest)
+        c_lo, c_hi = self._bounds(col_feature, col_edges, right, include_lowest)
+
+        r_lo, r_hi = self._snap(row_feature, r_lo), self._snap(row_feature, r_hi)
+        c_lo, c_hi = self._snap(col_feature, c_lo), self._snap(col_feature, c_hi)
+        sat_total, sat_pos = self._pair_table(row_feature, col_feature)
+
+        def rect(sat):
+            return (sat[np.ix_(r_hi, c_hi)] - sat[np.ix_(r_lo, c_hi)]
+                    - sat[np.ix_(r_hi, c_lo)] + sat[np.ix_(r_lo, c_lo)])
+        total, pos = rect(sat_total), rect(sat_pos)
+
+        if row_labels is None:
+            row_labels = _bin_labels(row_edges, right)
+        if col_labels is None:
+            col_labels = _bin_labels(col_edges, right)
+        lower, upper = wilson_interval(pos, total)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rate = pos / total
+
+        def frame(values):
+            return pd.DataFrame(values, index=row_labels, columns=col_labels)
+
+        return {
+            "DiabetesRate": frame(rate),
+            "SampleSize": frame(total),
+            "CI_lower": frame(lower),
+            "CI_upper": frame(upper),
+        }
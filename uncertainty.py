@@ -0,0 +1,101 @@
+import hashlib
+import os
+import tempfile
+import zipfile
+
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.linear_model import LogisticRegression
+from calibration import apply_calibration
+
+ENSEMBLE_CACHE_DIR = os.path.join(".cache", "ensembles")
+
+
+def dataset_hash(X, y, *params):
+    """Stable fingerprint of the training data plus the ensemble settings."""
+    h = hashlib.sha256()
+    h.update(np.ascontiguousarray(X, dtype=np.float64).tobytes())
+    h.update(np.ascontiguousarray(y, dtype=np.int64).tobytes())
+    h.update(repr((np.shape(X),) + params).encode())
+    return h.hexdigest()[:16]
+
+
+def _fit_member(X, y, seed, max_iter):
+    rng = np.random.default_rng(seed)
+    idx = rng.integers(0, len(y), len(y))
+    member = LogisticRegression(max_iter=max_iter)
+    member.fit(X[idx], y[idx])
+    return member.coef_[0], member.intercept_[0]
+
+
+def _read_ensemble(path, n_members, n_features):
+    # A missing, truncated or malformed cache file is a cache miss
+    try:
+        with np.load(path) as data:
+            ensemble = {"coef": data["coef"], "intercept": data["intercept"]}
+    except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+        return None
+    if ensemble["coef"].shape != (n_members, n_features) or ensemble["intercept"].shape != (n_members,):
+        return None
+    return ensemble
+
+
+def fit_bootstrap_ensemble(X, y, n_members=200, max_iter=1000, random_state=0,
+                           n_jobs=-1, cache_dir=ENSEMBLE_CACHE_DIR):
+    """Train (or load from disk) a bootstrap ensemble of 5-feature logistic models.
+
+    Members are stored as a stacked coefficient matrix of shape
+    (n_members, n_features) plus an intercept vector.
+    """
+    X = np.ascontiguousarray(X, dtype=np.float64)
+    y = np.asarray(y)
+    key = dataset_hash(X, y, n_members, max_iter, random_state)
+    path = os.path.join(cache_dir, f"ensemble_{key}.npz")
+
+    cached = _read_ensemble(path, n_members, X.shape[1])
+    if cached is not None:
+        return cached
+
+    members = Parallel(n_jobs=n_jobs)(
+        delayed(_fit_member)(X, y, random_state + i, max_iter) for i in range(n_members)
+    )
+    ensemble = {
+        "coef": np.vstack([coef for coef, _ in members]),
+        "intercept": np.array([intercept for _, intercept in members]),
+    }
+
+    # Each writer gets its own temp file, so concurrent cold starts never share one
+    os.makedirs(cache_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, prefix=f".ensemble_{key}.", suffix=".npz")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, **ensemble)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return ensemble
+
+
+def ensemble_proba(ensemble, X):
+    """Positive-class probability of every member for every row: shape (n_rows, n_members)."""
+    X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+    logits = X @ ensemble["coef"].T + ensemble["intercept"]
+    return 1.0 / (1.0 + np.exp(-logits))
+
+
+def risk_interval(ensemble, X, model=None, level=0.95):
+    """Percentile interval of the ensemble's (calibrated) risk for each row of `X`.
+
+    Members are passed through `model`'s calibration map, which must be a
+    smooth (Platt) map: an isotonic step map collapses many intervals to zero width.
+    """
+    probs = ensemble_proba(ensemble, X)
+    if model is not None:
+        table = getattr(model, "calibration_", None)
+        if table is not None and table["method"] != "sigmoid":
+            raise ValueError("Ensemble members need a smooth calibration map; fit the model with method='sigmoid'")
+        probs = apply_calibration(model, probs)
+    tail = (1.0 - level) / 2.0
+    lower, upper = np.quantile(probs, [tail, 1.0 - tail], axis=1)
+    return lower, upper